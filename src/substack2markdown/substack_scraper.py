@@ -1,31 +1,36 @@
 import argparse
-import json
-import os
 import io
+import os
 import re
-import base64
 import hashlib
-import mimetypes
 from pathlib import Path
-from urllib.parse import urlparse, unquote
+from urllib.parse import urlparse, unquote, parse_qs
 from abc import ABC, abstractmethod
-from typing import List, Optional, Tuple
+from typing import BinaryIO, List, Optional, Tuple, Union
 from time import sleep
 import asyncio
 import atexit
 import signal
 import string
-
-import html2text
-import markdown
+import gzip
+import functools
+import shutil
+import tempfile
+
+import orjson
+try:
+    # SIMD accelerated, same API as the base64 module
+    import pybase64 as base64
+except ImportError:
+    import base64
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
 from datetime import datetime
 from tqdm import tqdm
-from xml.etree import ElementTree as ET
-
-from selenium_driverless import webdriver
-from selenium_driverless.types.by import By
+from lxml import etree
 
 USE_PREMIUM: bool = True  # Set to True if you want to login to Substack and convert paid for posts
 BASE_SUBSTACK_URL: str = "https://www.thefitzwilliam.com/"  # Substack you want to convert to markdown
@@ -45,22 +50,94 @@ DEFAULT_POSTS_HTML_PATH_FORMAT = "index.html"
 DEFAULT_POSTS_JSON_PATH_FORMAT = "posts.json"
 DEFAULT_POST_JSON_PATH_FORMAT = "p/$post_slug/post.json"
 DEFAULT_COMMENTS_JSON_PATH_FORMAT = "p/$post_slug/comments.json"
-
-json_dump_kwargs = dict(
-    ensure_ascii=False,
-    indent=0,
-    separators=(',', ':'),
-)
-
-def count_images_in_markdown(md_content: str) -> int:
-    """Count number of Substack CDN image URLs in markdown content."""
-    # [![](https://substackcdn.com/image/fetch/x.png)](https://substackcdn.com/image/fetch/x.png)
-    # regex lookahead: match "...)" but not "...)]" suffix
-    pattern = re.compile(r'\(https://substackcdn\.com/image/fetch/[^\s\)]+\)(?=[^\]]|$)')
-    matches = re.findall(pattern, md_content)
-    return len(matches)
-
-
+DEFAULT_HTTP_CACHE_PATH_FORMAT = ".http_cache"
+DEFAULT_POSTS_JSONL_PATH_FORMAT = "posts.jsonl"
+OUTPUT_FORMATS = ("files", "jsonl")
+DEFAULT_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0"
+REQUESTS_TIMEOUT = (5, 30)  # (connect, read) timeout in seconds
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+MAX_RETRIES = 3
+RETRY_BACKOFF_FACTOR = 0.5  # seconds, doubled on every retry
+MAX_IMAGE_CONCURRENCY = 16  # image downloads at the same time, over all posts
+DOWNLOAD_CHUNK_SIZE = 1 << 18  # 256 KiB per read and write
+WRITE_QUEUE_SIZE = 256  # pending file writes before scrapers wait for the writer
+LOGIN_TIMEOUT = 30  # seconds to wait for each step of the premium login
+LOGGED_IN_COOKIE = "substack.lli"  # set by substack while a user is logged in
+SITEMAP_URL_TAG = "{http://www.sitemaps.org/schemas/sitemap/0.9}url"
+SITEMAP_LOC_TAG = "{http://www.sitemaps.org/schemas/sitemap/0.9}loc"
+
+# CSS selectors for Substack post pages
+TITLE_SELECTOR = "h1.post-title, h2"  # sometimes h2 if video present
+SUBTITLE_SELECTOR = "h3.subtitle"
+DATE_SELECTOR = "div.pencraft.pc-reset.color-pub-secondary-text-hGQ02T"
+JSON_LD_SELECTOR = 'script[type="application/ld+json"]'
+LIKE_COUNT_SELECTOR = "a.post-ufi-button .label"
+CONTENT_SELECTOR = "div.available-content"
+PAYWALL_SELECTOR = "h2.paywall-title"
+# lexbor matches the script text in C, so other scripts are never converted to str
+WINDOW_PRELOADS_SELECTOR = 'script:lexbor-contains("window._preloads")'
+
+DATE_PUBLISHED_PATTERN = re.compile(r'"datePublished"\s*:\s*"([^"]+)"')
+DATE_FORMAT = "%b %d, %Y"  # "Oct 01, 2025"
+
+# HTML page around the content of a post
+POST_HTML_TEMPLATE = """\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Markdown Content</title>
+<link rel="stylesheet" href="{css_path}">
+</head>
+<body>
+<main class="markdown-content">
+{content}
+</main>
+</body>
+</html>
+"""
+
+ESSAYS_DATA_SCRIPT = '<script type="application/json" id="essaysData"></script>'
+AUTHOR_TEMPLATE_PATTERN = re.compile(r'"\.\./assets|<!-- AUTHOR_NAME -->')
+
+# [![](https://substackcdn.com/image/fetch/x.png)](https://substackcdn.com/image/fetch/x.png)
+CDN_IMAGE_URL_PATTERN = re.compile(r'\((https://substackcdn\.com/image/fetch/[^\s\)]+)\)')
+CDN_IMAGE_URL_PREFIX = "https://substackcdn.com/image/fetch/"
+INVALID_FILENAME_CHARS_PATTERN = re.compile(r'[<>:"/\\|?*]')
+POST_SLUG_PATTERN = re.compile(r'/p/([^/]+)')
+NEWLINES_PATTERN = re.compile(r'\n+')
+JSON_INDENT_PATTERN = re.compile(rb'\n +')
+
+# image types served by substack, checked without the mimetypes database
+IMAGE_EXTENSIONS = frozenset((".jpg", ".jpeg", ".png", ".gif", ".webp", ".avif", ".svg", ".heic"))
+
+# escape user content in comments with one pass per string
+HTML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+})
+
+def guess_image_extension(url: str) -> str:
+    """Guess the file extension of an image from its URL, without a request."""
+    parsed_url = urlparse(url)
+    ext = os.path.splitext(unquote(parsed_url.path))[1].lower()
+    if ext in IMAGE_EXTENSIONS:
+        return ext
+    # https://example.com/image?format=webp
+    # the query value ends up in a file path, so only known extensions are used
+    image_format = parse_qs(parsed_url.query).get("format")
+    if image_format:
+        ext = "." + image_format[0].lower()
+        if ext in IMAGE_EXTENSIONS:
+            return ext
+    return ".jpg"
+
+
+# images like author avatars repeat across posts, so both helpers are cached per URL
+@functools.lru_cache(maxsize=4096)
 def sanitize_image_filename(url: str) -> str:
     """Create a safe filename from URL or content."""
     # Extract original filename from CDN URL
@@ -72,28 +149,192 @@ def sanitize_image_filename(url: str) -> str:
         filename = url.split("/")[-1]
 
     # Remove invalid characters
-    filename = re.sub(r'[<>:"/\\|?*]', '', filename)
+    filename = INVALID_FILENAME_CHARS_PATTERN.sub('', filename)
 
     # If filename is too long or empty, create hash-based name
     if len(filename) > 100 or not filename:
         hash_object = hashlib.md5(url.encode())
-        ext = mimetypes.guess_extension(requests.head(url).headers.get('content-type', '')) or '.jpg'
+        ext = guess_image_extension(url)
         filename = f"{hash_object.hexdigest()}{ext}"
 
     return filename
 
 
+@functools.lru_cache(maxsize=4096)
 def resolve_image_url(url: str) -> str:
     """Get the original image URL."""
     # https://substackcdn.com/image/fetch/xxx/https%3A%2F%2Fsubstack-post-media.s3.amazonaws.com%2Fpublic%2Fimages%2Fxxx
-    if url.startswith("https://substackcdn.com/image/fetch/"):
+    if url.startswith(CDN_IMAGE_URL_PREFIX):
         # substackcdn.com returns a compressed version of the original image
         url = "https://" + unquote(url.split("/https%3A%2F%2F")[1])
     return url
 
 
+def get_retry_delay(headers, attempt: int) -> float:
+    """
+    Returns the seconds to wait before retrying a rate limited or failed request.
+    Uses the Retry-After header if the server sent one, else exponential backoff.
+    """
+    retry_after = headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return float(retry_after)
+    return RETRY_BACKOFF_FACTOR * (2 ** attempt)
+
+
+def dumps_json(obj) -> bytes:
+    """
+    Serializes obj with orjson, one value per line and without indentation,
+    so the JSON files stay readable in line-based diffs.
+    """
+    return JSON_INDENT_PATTERN.sub(b'\n', orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+
+
+def write_bytes_atomic(path: str, data: bytes) -> None:
+    """
+    Writes data to a temporary file next to path, then renames it to path,
+    so readers and crashed runs never see a partially written file.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+def link_file(src: str, dst) -> None:
+    """
+    Hardlinks src to dst, or copies it when the filesystem has no hardlinks.
+    """
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        pass
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def scandir_files(directories) -> set:
+    """
+    Lists the files in directories with one scandir call per directory.
+    Returns a set of normalized file paths.
+    """
+    files = set()
+    for directory in directories:
+        try:
+            with os.scandir(directory or ".") as entries:
+                files.update(os.path.normpath(entry.path) for entry in entries)
+        except FileNotFoundError:
+            pass
+    return files
+
+
+def load_jsonl(path: str) -> list:
+    """
+    Reads the objects from a JSONL file.
+    Returns an empty list if the file does not exist.
+    Skips a truncated last line, left by an interrupted writer.
+    """
+    objects = []
+    try:
+        with open(path, 'rb') as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    objects.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    pass
+    except FileNotFoundError:
+        pass
+    return objects
+
+
+def load_jsonl_urls(path: str) -> set:
+    """
+    Reads the post URLs from a JSONL archive.
+    Returns an empty set if the archive does not exist.
+    """
+    return {record["url"] for record in load_jsonl(path)}
+
+
+def dedupe_jsonl(path: str) -> None:
+    """
+    Rewrites a JSONL archive with only the last record of every URL,
+    in the order the URLs first appear.
+    """
+    records = {}
+    for record in load_jsonl(path):
+        records[record["url"]] = record
+    write_bytes_atomic(path, b"".join(orjson.dumps(record) + b"\n" for record in records.values()))
+
+
+def append_line(file, data: bytes) -> None:
+    """Appends one line to a journal file and flushes it, so it survives a crash."""
+    file.write(data)
+    file.flush()
+
+
+@functools.lru_cache(maxsize=1024)
+def relpath_cached(path: str, start: str) -> str:
+    """
+    Cached os.path.relpath, for directories that repeat like the image directory.
+    The working directory does not change while scraping, so the result is stable.
+    """
+    return os.path.relpath(path, start)
+
+
+def relpath_fast(path: str, start: str) -> str:
+    """
+    os.path.relpath for a path below start, by slicing instead of two abspath calls.
+    Other paths fall back to os.path.relpath.
+    """
+    prefix = start + os.sep
+    if start and path.startswith(prefix):
+        return os.path.normpath(path[len(prefix):])
+    return os.path.relpath(path, start)
+
+
+@functools.lru_cache(maxsize=4)
+def load_author_template(path: str) -> Tuple[str, str, str]:
+    """
+    Reads an author template and splits it around the embedded essays data script.
+    Returns (prefix, separator, suffix) like str.partition.
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        html_template = file.read()
+    return html_template.partition(ESSAYS_DATA_SCRIPT)
+
+
+class PathTemplate:
+    """
+    A string.Template that is converted once to a str.format string.
+    substitute runs in C, without a regex pass per call.
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        parts = []
+        last_end = 0
+        for match in string.Template.pattern.finditer(template):
+            parts.append(template[last_end:match.start()].replace("{", "{{").replace("}", "}}"))
+            if match.group("escaped") is not None:
+                parts.append("$")
+            elif match.group("invalid") is not None:
+                # same error as string.Template.substitute
+                lines = template[:match.start("invalid")].splitlines(keepends=True)
+                raise ValueError("Invalid placeholder in string: line %d, col %d" % (
+                    len(lines) or 1, len(lines[-1]) if lines else 1))
+            else:
+                parts.append("{" + (match.group("named") or match.group("braced")) + "}")
+            last_end = match.end()
+        parts.append(template[last_end:].replace("{", "{{").replace("}", "}}"))
+        self.format_string = "".join(parts)
+
+    def substitute(self, mapping: dict) -> str:
+        return self.format_string.format_map(mapping)
+
+
 def get_post_slug(url: str) -> str:
-    match = re.search(r'/p/([^/]+)', url)
+    match = POST_SLUG_PATTERN.search(url)
     return match.group(1) if match else 'unknown_post'
 
 
@@ -104,6 +345,9 @@ def extract_main_part(url: str) -> str:
 
 
 class BaseSubstackScraper(ABC):
+    # maximum number of posts to scrape at the same time
+    max_concurrency: int = 8
+
     def __await__(self):
         return self._async_init().__await__()
 
@@ -114,37 +358,102 @@ class BaseSubstackScraper(ABC):
         await self.close()
 
     async def close(self):
-        pass
+        self.save_http_cache()
+        self.session.close()
+        await self.http_session.close()
 
     def __init__(self, args):
         self.args = args
         if not self.args.url.endswith("/"):
             self.args.url += "/"
+        if self.args.concurrency:
+            self.max_concurrency = self.args.concurrency
 
         self.publication_handle: str = extract_main_part(self.args.url)
+        # links to other posts of this publication
+        self.post_link_prefix = "](https://" + self.publication_handle + ".substack.com/p/"
+        self.post_link_pattern = re.compile(
+            r'\]\(https://' + re.escape(self.publication_handle) + r'\.substack\.com/p/([^\s\)]+)\)'
+        )
 
         self.output_directory_template = string.Template(self.args.output_directory_format)
 
         # all these paths are relative to output_directory
-        self.md_path_template = string.Template(self.args.md_path_format)
-        self.html_path_template = string.Template(self.args.html_path_format)
-        self.image_path_template = string.Template(self.args.image_path_format)
+        # the per-post templates are substituted for every post and image
+        self.md_path_template = PathTemplate(self.args.md_path_format)
+        self.html_path_template = PathTemplate(self.args.html_path_format)
+        self.image_path_template = PathTemplate(self.args.image_path_format)
         self.posts_md_path_template = string.Template(self.args.posts_md_path_format)
         self.posts_html_path_template = string.Template(self.args.posts_html_path_format)
         self.posts_json_path_template = string.Template(self.args.posts_json_path_format)
-        self.post_json_path_template = string.Template(self.args.post_json_path_format)
-        self.comments_json_path_template = string.Template(self.args.comments_json_path_format)
+        self.post_json_path_template = PathTemplate(self.args.post_json_path_format)
+        self.comments_json_path_template = PathTemplate(self.args.comments_json_path_format)
 
         self.format_vars = {
             "publication_handle": self.publication_handle,
             "publication_domain": f"{self.publication_handle}.substack.com",
         }
 
+        output_directory = self.output_directory_template.substitute(self.format_vars)
+        self.format_vars["output_directory"] = output_directory
+
+        # paths of files shared by all posts
+        self.posts_json_path = os.path.join(
+            output_directory,
+            self.posts_json_path_template.substitute(self.format_vars)
+        )
+        self.posts_md_path = os.path.join(
+            output_directory,
+            self.posts_md_path_template.substitute(self.format_vars)
+        )
+        self.posts_html_path = os.path.join(
+            output_directory,
+            self.posts_html_path_template.substitute(self.format_vars)
+        )
+        self.posts_jsonl_path = os.path.join(
+            output_directory,
+            string.Template(self.args.posts_jsonl_path_format).substitute(self.format_vars)
+        )
+        self.http_cache_directory = os.path.join(
+            output_directory,
+            string.Template(self.args.http_cache_path_format).substitute(self.format_vars)
+        )
+        self.http_cache = self.load_http_cache()
+        self.created_directories = set()
+
+        # reuse one connection pool for all requests to the same substack host
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=MAX_RETRIES,
+                backoff_factor=RETRY_BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUS_CODES,
+                # return the last error response, callers check response.ok
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": self.args.user_agent or DEFAULT_USER_AGENT,
+            "Accept-Encoding": "gzip, deflate",
+        })
+
         self.keywords: List[str] = ["about", "archive", "podcast"]
         self.post_urls: List[str] = self.get_all_post_urls()
 
     async def _async_init(self):
         self._loop = asyncio.get_running_loop()
+        self.http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=self.max_concurrency, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(sock_connect=REQUESTS_TIMEOUT[0], sock_read=REQUESTS_TIMEOUT[1]),
+            headers={"User-Agent": self.session.headers["User-Agent"]},
+        )
+        self.image_semaphore = asyncio.Semaphore(MAX_IMAGE_CONCURRENCY)
+        self.image_downloads = {} # save_path: download task
+        self.image_fetches = {} # url: fetch_image_to_cache task
+        self.existing_images = {} # image directory: files from before this run
         return self
 
     def get_all_post_urls(self) -> List[str]:
@@ -160,34 +469,138 @@ class BaseSubstackScraper(ABC):
 
     def get_all_post_urls_offline(self) -> List[str]:
         # Read JSON data
-        output_directory = self.output_directory_template.substitute(self.format_vars)
-        self.format_vars["output_directory"] = output_directory
-        posts_json_path = os.path.join(
-            # self.format_vars["output_directory"] = 
-            self.format_vars["output_directory"],
-            self.posts_json_path_template.substitute(self.format_vars)
-        )
-        with open(posts_json_path, 'r', encoding='utf-8') as file:
-            posts_data = json.load(file)
+        with open(self.posts_json_path, 'rb') as file:
+            posts_data = orjson.loads(file.read())
         urls = []
         for post in posts_data:
             post["slug"] = post["html_link"].split("/")[-2] # FIXME remove
             urls.append(self.args.url + "p/" + post["slug"])
         return urls
 
+    def load_http_cache(self) -> dict:
+        """
+        Loads the ETag and Last-Modified headers of previous responses.
+        """
+        cache_json_path = os.path.join(self.http_cache_directory, "cache.json")
+        if not os.path.exists(cache_json_path):
+            return {}
+        with open(cache_json_path, 'rb') as file:
+            return orjson.loads(file.read())
+
+    def save_http_cache(self) -> None:
+        if not self.http_cache:
+            return
+        self.makedirs(self.http_cache_directory)
+        cache_json_path = os.path.join(self.http_cache_directory, "cache.json")
+        write_bytes_atomic(cache_json_path, dumps_json(self.http_cache))
+
+    def get_http_cache_path(self, url: str) -> str:
+        return os.path.join(self.http_cache_directory, hashlib.sha256(url.encode()).hexdigest())
+
+    def get_existing_images(self, directory: str) -> set:
+        """
+        Lists the files of an image directory with one scandir call per run,
+        instead of one stat call per image. Images downloaded in this run are in image_downloads.
+        """
+        files = self.existing_images.get(directory)
+        if files is None:
+            files = self.existing_images[directory] = scandir_files([directory])
+        return files
+
+    def makedirs(self, directory) -> None:
+        """
+        Creates a directory and its parents, with at most one syscall per directory and run.
+        """
+        directory = str(directory)
+        if directory in self.created_directories:
+            return
+        os.makedirs(directory, exist_ok=True)
+        self.created_directories.add(directory)
+
+    def get_image_cache_path(self, url: str) -> str:
+        key = hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.http_cache_directory, "images", key[:2], key)
+
+    def get_conditional_headers(self, url: str) -> dict:
+        """
+        Returns If-None-Match and If-Modified-Since headers for a cached response.
+        """
+        entry = self.http_cache.get(url)
+        if entry is None or not os.path.exists(self.get_http_cache_path(url)):
+            return {}
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    @staticmethod
+    def has_http_validator(headers) -> bool:
+        """Responses without ETag or Last-Modified cannot be revalidated, so caching them is wasted I/O."""
+        return "ETag" in headers or "Last-Modified" in headers
+
+    def update_http_cache(self, url: str, headers) -> None:
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if etag or last_modified:
+            self.http_cache[url] = {"etag": etag, "last_modified": last_modified}
+        else:
+            self.http_cache.pop(url, None)
+
+    def fetch_to_http_cache(self, url: str) -> Optional[Union[str, BinaryIO]]:
+        """
+        Downloads url to the HTTP cache with a conditional GET request.
+        Returns the path of the cached response body, the body as a file object
+        if the response cannot be cached, or None on error.
+        """
+        cache_path = self.get_http_cache_path(url)
+        headers = self.get_conditional_headers(url)
+        try:
+            with self.session.get(url, headers=headers, stream=True, timeout=REQUESTS_TIMEOUT) as response:
+                if response.status_code == 304:
+                    return cache_path
+                if not response.ok:
+                    print(f'Error fetching {url}: {response.status_code}')
+                    return None
+                if not self.has_http_validator(response.headers):
+                    self.http_cache.pop(url, None)
+                    return io.BytesIO(response.content)
+                self.makedirs(self.http_cache_directory)
+                # a truncated body must never sit behind a cached ETag, so rename it into place
+                fd, tmp_path = tempfile.mkstemp(dir=self.http_cache_directory, suffix=".tmp")
+                try:
+                    with open(fd, 'wb') as file:
+                        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            file.write(chunk)
+                    os.replace(tmp_path, cache_path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+                self.update_http_cache(url, response.headers)
+        except requests.RequestException as e:
+            print(f'Error fetching {url}: {e}')
+            return None
+        return cache_path
+
     def fetch_urls_from_sitemap(self) -> List[str]:
         """
         Fetches URLs from sitemap.xml.
         """
         sitemap_url = f"{self.args.url}sitemap.xml"
-        response = requests.get(sitemap_url)
-
-        if not response.ok:
-            print(f'Error fetching sitemap at {sitemap_url}: {response.status_code}')
+        sitemap_path = self.fetch_to_http_cache(sitemap_url)
+        if sitemap_path is None:
             return []
 
-        root = ET.fromstring(response.content)
-        urls = [element.text for element in root.iter('{http://www.sitemaps.org/schemas/sitemap/0.9}loc')]
+        # free each <url> element after reading it
+        urls = []
+        for _, element in etree.iterparse(sitemap_path, tag=SITEMAP_URL_TAG):
+            loc = element.findtext(SITEMAP_LOC_TAG)
+            if loc:
+                urls.append(loc)
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del element.getparent()[0]
         return urls
 
     def fetch_urls_from_feed(self) -> List[str]:
@@ -196,18 +609,19 @@ class BaseSubstackScraper(ABC):
         """
         print('Falling back to feed.xml. This will only contain up to the 22 most recent posts.')
         feed_url = f"{self.args.url}feed.xml"
-        response = requests.get(feed_url)
-
-        if not response.ok:
-            print(f'Error fetching feed at {feed_url}: {response.status_code}')
+        feed_path = self.fetch_to_http_cache(feed_url)
+        if feed_path is None:
             return []
 
-        root = ET.fromstring(response.content)
+        # free each <item> element after reading it
         urls = []
-        for item in root.findall('.//item'):
-            link = item.find('link')
-            if link is not None and link.text:
-                urls.append(link.text)
+        for _, element in etree.iterparse(feed_path, tag='item'):
+            link = element.findtext('link')
+            if link:
+                urls.append(link)
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del element.getparent()[0]
 
         return urls
 
@@ -216,15 +630,19 @@ class BaseSubstackScraper(ABC):
         """
         This method filters out URLs that contain certain keywords
         """
-        return [url for url in urls if all(keyword not in url for keyword in keywords)]
+        if not keywords:
+            return list(urls)
+        # one regex scan per URL instead of one substring scan per keyword
+        pattern = re.compile("|".join(map(re.escape, keywords)))
+        return [url for url in urls if not pattern.search(url)]
 
     @staticmethod
     def html_to_md(html_content: str) -> str:
         """
         This method converts HTML to Markdown
         """
-        if not isinstance(html_content, str):
-            raise ValueError("html_content must be a string")
+        assert isinstance(html_content, str), "html_content must be a string"
+        import html2text  # imported on first use, cached in sys.modules
         h = html2text.HTML2Text()
         h.ignore_links = False
         h.body_width = 0
@@ -235,25 +653,23 @@ class BaseSubstackScraper(ABC):
         """
         This method saves content to a file. Can be used to save HTML or Markdown
         """
-        if not isinstance(filepath, str):
-            raise ValueError("filepath must be a string")
-
-        if not isinstance(content, str):
-            raise ValueError("content must be a string")
+        assert isinstance(filepath, str), "filepath must be a string"
+        assert isinstance(content, str), "content must be a string"
 
         # if os.path.exists(filepath):
         if False:
             print(f"File already exists: {filepath}")
             return
 
-        with open(filepath, 'w', encoding='utf-8') as file:
-            file.write(content)
+        # encode once and write the bytes in one call, bypassing the text IO layer
+        write_bytes_atomic(filepath, content.encode('utf-8'))
 
     @staticmethod
     def md_to_html(md_content: str) -> str:
         """
         This method converts Markdown to HTML
         """
+        import markdown  # imported on first use, cached in sys.modules
         return markdown.markdown(md_content, extensions=['extra'])
 
 
@@ -261,11 +677,8 @@ class BaseSubstackScraper(ABC):
         """
         This method saves HTML content to a file with a link to an external CSS file.
         """
-        if not isinstance(filepath, str):
-            raise ValueError("filepath must be a string")
-
-        if not isinstance(content, str):
-            raise ValueError("content must be a string")
+        assert isinstance(filepath, str), "filepath must be a string"
+        assert isinstance(content, str), "content must be a string"
 
         # Calculate the relative path from the HTML file to the CSS file
         html_dir = os.path.dirname(filepath)
@@ -274,36 +687,21 @@ class BaseSubstackScraper(ABC):
             css_path = os.path.relpath(css_path, html_dir)
         css_path = css_path.replace("\\", "/")  # Ensure forward slashes for web paths
 
-        html_content = f"""
-            <!DOCTYPE html>
-            <html lang="en">
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>Markdown Content</title>
-                <link rel="stylesheet" href="{css_path}">
-            </head>
-            <body>
-                <main class="markdown-content">
-                {content}
-                </main>
-            </body>
-            </html>
-        """
+        html_content = POST_HTML_TEMPLATE.format(css_path=css_path, content=content)
+        html_bytes = html_content.encode('utf-8')
 
-        with open(filepath, 'w', encoding='utf-8') as file:
-            file.write(html_content)
+        write_bytes_atomic(filepath, html_bytes)
+        if self.args.gzip_html:
+            # static web servers can serve the precompressed file
+            write_bytes_atomic(filepath + ".gz", gzip.compress(html_bytes, compresslevel=6))
 
     @staticmethod
     def get_filename_from_url(url: str, filetype: str = ".md") -> str:
         """
         Gets the filename from the URL (the ending)
         """
-        if not isinstance(url, str):
-            raise ValueError("url must be a string")
-
-        if not isinstance(filetype, str):
-            raise ValueError("filetype must be a string")
+        assert isinstance(url, str), "url must be a string"
+        assert isinstance(filetype, str), "filetype must be a string"
 
         if not filetype.startswith("."):
             filetype = f".{filetype}"
@@ -315,11 +713,8 @@ class BaseSubstackScraper(ABC):
         """
         Combines the title, subtitle, and content into a single string with Markdown format
         """
-        if not isinstance(title, str):
-            raise ValueError("title must be a string")
-
-        if not isinstance(content, str):
-            raise ValueError("content must be a string")
+        assert isinstance(title, str), "title must be a string"
+        assert isinstance(content, str), "content must be a string"
 
         metadata = f"# {title}\n\n"
         if subtitle:
@@ -329,53 +724,46 @@ class BaseSubstackScraper(ABC):
 
         return metadata + content
 
-    def extract_post_data(self, soup: BeautifulSoup) -> Tuple[str, str, str, str, str]:
+    def extract_post_data(self, soup: LexborHTMLParser) -> Tuple[str, str, str, str, str]:
         """
         Converts a Substack post soup to markdown, returning metadata and content.
         Returns (title, subtitle, like_count, date, md_content).
         """
         # Title (sometimes h2 if video present)
-        title_element = soup.select_one("h1.post-title, h2")
-        title = title_element.text.strip() if title_element else "Untitled"
+        title_element = soup.css_first(TITLE_SELECTOR)
+        title = title_element.text().strip() if title_element else "Untitled"
 
         # Subtitle
-        subtitle_element = soup.select_one("h3.subtitle")
-        subtitle = subtitle_element.text.strip() if subtitle_element else ""
+        subtitle_element = soup.css_first(SUBTITLE_SELECTOR)
+        subtitle = subtitle_element.text().strip() if subtitle_element else ""
 
         # Date — try CSS selector first
-        date = ""
-        date_element = soup.select_one("div.pencraft.pc-reset.color-pub-secondary-text-hGQ02T")
-        if date_element and date_element.text.strip():
-            date = date_element.text.strip()
+        date_element = soup.css_first(DATE_SELECTOR)
+        date = date_element.text().strip() if date_element else ""
 
         # Fallback: JSON-LD metadata
         if not date:
-            script_tag = soup.find("script", {"type": "application/ld+json"})
-            if script_tag and script_tag.string:
+            script_tag = soup.css_first(JSON_LD_SELECTOR)
+            # only datePublished is needed, so dont parse the whole JSON document
+            match = DATE_PUBLISHED_PATTERN.search(script_tag.text()) if script_tag else None
+            if match:
                 try:
-                    metadata = json.loads(script_tag.string)
-                    if "datePublished" in metadata:
-                        date_str = metadata["datePublished"]
-                        date_obj = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                        date = date_obj.strftime("%b %d, %Y")
-                except (json.JSONDecodeError, ValueError, KeyError):
+                    date_obj = datetime.fromisoformat(match.group(1).replace("Z", "+00:00"))
+                    date = date_obj.strftime(DATE_FORMAT)
+                except ValueError:
                     pass
 
         if not date:
             date = "Date not found"
 
         # Like count
-        like_count_element = soup.select_one("a.post-ufi-button .label")
-        like_count = (
-            like_count_element.text.strip()
-            if like_count_element and like_count_element.text.strip().isdigit()
-            else "0"
-        )
-        like_count = int(like_count)
+        like_count_element = soup.css_first(LIKE_COUNT_SELECTOR)
+        like_count = like_count_element.text().strip() if like_count_element else ""
+        like_count = int(like_count) if like_count.isdigit() else 0
 
         # Post content
-        content_element = soup.select_one("div.available-content")
-        content_html = str(content_element) if content_element else ""
+        content_element = soup.css_first(CONTENT_SELECTOR)
+        content_html = content_element.html if content_element else ""
         md = self.html_to_md(content_html)
 
         # Combine metadata + content
@@ -393,8 +781,7 @@ class BaseSubstackScraper(ABC):
 
         date = post_preloads["post"]["post_date"] # date in ISO format: "2025-10-01T14:43:48.389Z"
 
-        # datetime_format = "%b %d, %Y" # "Oct 01, 2025"
-        # date = datetime.strptime(date, "%Y-%m-%dT%H:%M:%S.%fZ").strftime(datetime_format)
+        # date = datetime.strptime(date, "%Y-%m-%dT%H:%M:%S.%fZ").strftime(DATE_FORMAT)
 
         content_html = post_preloads["post"]["body_html"]
         md = self.html_to_md(content_html)
@@ -403,7 +790,7 @@ class BaseSubstackScraper(ABC):
 
         return title, subtitle, like_count, date, md_content
 
-    async def get_window_preloads(self, soup):
+    async def get_window_preloads(self, soup, url: str):
         # all comments are stored in javascript
         # <script>window._preloads = JSON.parse("{\"isEU\":true,\"language\":\"en\",...}")</script>
         # only some comments are rendered in html
@@ -411,61 +798,58 @@ class BaseSubstackScraper(ABC):
         # see also
         # https://www.selfpublife.com/p/automatically-expand-all-substack-comments
         window_preloads = None
-        for script_element in soup.select("script"):
-            script_text = script_element.text.strip()
+        # other scripts can reference window._preloads, so check the prefix
+        for script_element in soup.css(WINDOW_PRELOADS_SELECTOR):
+            script_text = script_element.text().strip()
             if not script_text.startswith("window._preloads"):
                 continue
             # pos1 = re.search(r'window._preloads\s*=\s*JSON\.parse\(', script_text).span()[1]
             pos1 = script_text.find("(") + 1
             pos2 = script_text.rfind(")")
-            window_preloads = json.loads(json.loads(script_text[pos1:pos2]))
+            # the outer JSON is a javascript string literal, the inner JSON is the large object.
+            # both are decoded by orjson, which unescapes the literal several times faster than json
+            window_preloads = orjson.loads(orjson.loads(script_text[pos1:pos2]))
             break
         assert window_preloads, f"not found <script>window._preloads...</script> at {url!r}"
         return window_preloads
 
     def count_comments(self, comments_preloads):
-
-        def count_comments_inner(comment):
-            res = 1
-            for child_comment in comment["children"]:
-                res += count_comments_inner(child_comment)
-            return res
-
+        # explicit stack instead of recursion, threads can be deeper than the recursion limit
         res = 0
-        for comment in comments_preloads["initialComments"]:
-            res += count_comments_inner(comment)
+        stack = list(comments_preloads["initialComments"])
+        while stack:
+            comment = stack.pop()
+            res += 1
+            stack.extend(comment["children"])
         return res
 
     def render_comments_html(self, comments_preloads):
 
         def render_comment_body(body):
-            body = body.strip()
-            body = "<p>" + body + "</p>"
-            body = body.replace("\n", "</p>\n<p>")
-            # TODO more?
-            return body
+            body = body.strip().translate(HTML_ESCAPE_TABLE)
+            return "<p>" + NEWLINES_PATTERN.sub("</p>\n<p>", body) + "</p>"
 
-        def render_comments_html_inner(comment, buf):
+        def render_comment_open(comment, parts):
+            # render the comment without its children and closing tags
             assert comment["type"] == "comment", f'unexpected comment type: {comment["type"]!r}'
-            buf.write(f'<details class="comment" id="{comment["id"]}" open>\n')
-            buf.write(f'<summary>\n')
+            parts.append(f'<details class="comment" id="{comment["id"]}" open>\n<summary>\n')
 
             # NOTE user IDs are constant, user handles are variable
             # when i change my user handle
             # then other users can use my old user handle
             if not comment["user_id"] is None:
-                buf.write(f'<a class="user" href="https://substack.com/profile/{comment["user_id"]}">')
+                parts.append(f'<a class="user" href="https://substack.com/profile/{comment["user_id"]}">')
 
             if not comment["name"] is None:
-                buf.write(comment["name"]) # human-readable username
+                parts.append(comment["name"].translate(HTML_ESCAPE_TABLE)) # human-readable username
             else:
                 # Comment removed
-                buf.write("null")
+                parts.append("null")
 
             if not comment["user_id"] is None:
-               buf.write('</a>\n')
+               parts.append('</a>\n')
             else:
-               buf.write('\n')
+               parts.append('\n')
 
             other_pub = comment["metadata"].get("author_on_other_pub")
             if other_pub:
@@ -474,251 +858,348 @@ class BaseSubstackScraper(ABC):
                 # then other users cannot use my old publication handle
                 # NOTE "Changing your publication's subdomain
                 # does not automatically set up a redirect from the old subdomain to the new one."
-                buf.write(f'(<a class="pub" pub-id="{other_pub["id"]}" href="{other_pub["base_url"]}">')
-                buf.write(other_pub["name"])
-                buf.write('</a>)\n')
+                base_url = other_pub["base_url"].translate(HTML_ESCAPE_TABLE)
+                parts.append(f'(<a class="pub" pub-id="{other_pub["id"]}" href="{base_url}">')
+                parts.append(other_pub["name"].translate(HTML_ESCAPE_TABLE))
+                parts.append('</a>)\n')
 
-            buf.write(comment["date"] + '\n') # "2025-05-17T06:51:39.485Z"
+            parts.append(comment["date"].translate(HTML_ESCAPE_TABLE) + '\n') # "2025-05-17T06:51:39.485Z"
 
             for reaction, reaction_count in comment["reactions"].items():
                 if reaction_count == 0: continue
-                buf.write(reaction + str(reaction_count) + '\n') # "❤123"
-                # buf.write(str(reaction_count) + reaction + '\n') # "123❤"
+                parts.append(reaction + str(reaction_count) + '\n') # "❤123"
+                # parts.append(str(reaction_count) + reaction + '\n') # "123❤"
 
-            buf.write('</summary>\n')
-
-            buf.write('<blockquote>\n')
-            buf.write('\n')
+            parts.append('</summary>\n<blockquote>\n\n')
 
             if comment["body"] is None:
                 # Comment removed
                 status = comment.get("status")
                 if status is None:
-                    buf.write('(Comment removed)\n')
+                    parts.append('(Comment removed)\n')
                 else:
                     # "moderator_removed", ...
-                    buf.write('(status:' + status + ')\n')
+                    parts.append('(status:' + status.translate(HTML_ESCAPE_TABLE) + ')\n')
                 # TODO comment["bans"]
                 # TODO comment["suppressed"]
                 # TODO comment["user_banned"]
                 # TODO comment["user_banned_for_comment"]
             else:
-                buf.write(render_comment_body(comment["body"]) + '\n')
-
-            for child_comment in comment["children"]:
-                buf.write('\n')
-                render_comments_html_inner(child_comment, buf)
-            buf.write('</blockquote>\n')
+                parts.append(render_comment_body(comment["body"]) + '\n')
 
-            buf.write('</details>\n')
-            buf.write('\n')
+        comment_close = '</blockquote>\n</details>\n\n'
 
-        buf = io.StringIO()
+        parts = []
         # NOTE the name "initial" is misleading. all comments are stored in this array
         # NOTE comments are sorted by likes
-        for comment in comments_preloads["initialComments"]:
-            render_comments_html_inner(comment, buf)
-        return buf.getvalue()
+        # depth-first with an explicit stack of comments and closing tags
+        stack = list(reversed(comments_preloads["initialComments"]))
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+                continue
+            render_comment_open(item, parts)
+            stack.append(comment_close)
+            for child_comment in reversed(item["children"]):
+                stack.append(child_comment)
+                stack.append('\n')
+        return ''.join(parts)
 
     @abstractmethod
-    async def get_url_soup(self, url: str) -> str:
+    async def get_url_soup(self, url: str) -> Optional[LexborHTMLParser]:
         raise NotImplementedError
 
     def save_posts_data_json(self, posts_data: list) -> None:
         """
         Saves essays data to a JSON file for a specific author.
         """
-        posts_json_path = os.path.join(
-            self.format_vars["output_directory"],
-            self.posts_json_path_template.substitute(self.format_vars)
-        )
-        os.makedirs(os.path.dirname(posts_json_path), exist_ok=True)
+        posts_json_path = self.posts_json_path
+        self.makedirs(os.path.dirname(posts_json_path))
+        merged = {}
         if os.path.exists(posts_json_path):
-            with open(posts_json_path, 'r', encoding='utf-8') as file:
-                existing_data = json.load(file)
-            # remove duplicates from existing_data
-            new_post_ids = set(map(lambda p: p["id"], posts_data))
-            existing_data = [p for p in posts_data if p["id"] not in new_post_ids]
-            posts_data = existing_data + posts_data
+            with open(posts_json_path, 'rb') as file:
+                merged = {p["id"]: p for p in orjson.loads(file.read())}
+        # new posts replace existing posts with the same id.
+        # a post from the journal of an interrupted run can be scraped again
+        merged.update((p["id"], p) for p in posts_data)
         # sort by post_id, descending
-        posts_data.sort(key=lambda p: -1*p["id"])
-        with open(posts_json_path, 'w', encoding='utf-8') as f:
-            json.dump(posts_data, f, **json_dump_kwargs)
+        posts_data = sorted(merged.values(), key=lambda p: p["id"], reverse=True)
+        write_bytes_atomic(posts_json_path, dumps_json(posts_data))
 
     async def scrape_posts(self, num_posts_to_scrape: int = 0) -> None:
         """
-        Iterates over all posts and saves them as markdown and html files
+        Scrapes posts concurrently and saves them as markdown and html files
         """
-        output_directory = self.output_directory_template.substitute(self.format_vars)
-        self.format_vars["output_directory"] = output_directory
-
-        posts_json_path = os.path.join(
-            self.format_vars["output_directory"],
-            self.posts_json_path_template.substitute(self.format_vars)
-        )
-        posts_json_dir = os.path.dirname(posts_json_path)
+        output_directory = self.format_vars["output_directory"]
+        posts_json_dir = os.path.dirname(self.posts_json_path)
 
-        posts_data = []
+        # metadata of the posts finished by an interrupted run
+        posts_journal_path = self.posts_json_path + ".jsonl"
+        posts_data = load_jsonl(posts_journal_path)
         post_urls_slice = self.post_urls if num_posts_to_scrape == 0 else self.post_urls[:num_posts_to_scrape]
-        for url in tqdm(post_urls_slice):
-            try:
-                post_slug = url.split("/")[-1]
-                self.format_vars["post_slug"] = post_slug
 
+        self.jsonl_file = None
+        if self.args.output_format == "jsonl":
+            self.existing_jsonl_urls = load_jsonl_urls(self.posts_jsonl_path)
+            self.makedirs(os.path.dirname(self.posts_jsonl_path) or ".")
+            self.jsonl_file = open(self.posts_jsonl_path, 'ab')
+        else:
+            md_filepaths = set()
+            for url in post_urls_slice:
                 md_filepath = os.path.join(
                     output_directory,
-                    self.md_path_template.substitute(self.format_vars)
+                    self.md_path_template.substitute({
+                        **self.format_vars,
+                        "post_slug": url.split("/")[-1],
+                    })
                 )
-                self.format_vars["md_filepath"] = md_filepath
-                self.format_vars["md_directory"] = os.path.dirname(md_filepath)
+                md_filepaths.add(os.path.normpath(md_filepath))
+            md_directories = set(map(os.path.dirname, md_filepaths))
+            if len(md_directories) < len(md_filepaths):
+                # flat layout: one scandir per directory replaces one stat per post
+                self.existing_md_filepaths = scandir_files(md_directories)
+            else:
+                # one directory per post: a stat per post is cheaper than a scandir per post
+                self.existing_md_filepaths = set(filter(os.path.exists, md_filepaths))
+
+        # scrapers hand their files to one writer task and continue with the next download
+        # bounded, so a slow disk makes the scrapers wait instead of buffering whole posts in memory
+        self.write_queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+        writer = asyncio.create_task(self.write_files(self.write_queue))
+
+        # append the metadata of every finished post, instead of rewriting posts.json per post
+        self.makedirs(posts_json_dir or ".")
+        posts_journal = open(posts_journal_path, 'ab')
+
+        async def collect(done):
+            for task in done:
+                post = task.result()
+                if post is not None:
+                    posts_data.append(post)
+                    # queued after the files of the post
+                    await self.write_queue.put((append_line, posts_journal, orjson.dumps(post) + b"\n"))
+            pbar.update(len(done))
+
+        # sliding window of tasks: a new post starts when one finishes,
+        # so memory does not grow with the number of posts
+        pending = set()
+        with tqdm(total=len(post_urls_slice)) as pbar:
+            for url in post_urls_slice:
+                if len(pending) >= self.max_concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    await collect(done)
+                pending.add(asyncio.create_task(self.scrape_post(url, posts_json_dir)))
+            if pending:
+                done, _ = await asyncio.wait(pending)
+                await collect(done)
+
+        await self.write_queue.put(None)
+        await writer
+        posts_journal.close()
+        if self.jsonl_file is not None:
+            self.jsonl_file.close()
+            if self.args.force and self.existing_jsonl_urls:
+                # posts scraped again were appended a second time
+                dedupe_jsonl(self.posts_jsonl_path)
 
-                html_filepath = os.path.join(
-                    output_directory,
-                    self.html_path_template.substitute(self.format_vars)
-                )
-                self.format_vars["html_filepath"] = html_filepath
-                self.format_vars["html_directory"] = os.path.dirname(html_filepath)
+        self.save_posts_data_json(posts_data)
+        os.remove(posts_journal_path)
+        self.generate_main_md_file()
+        self.generate_main_html_file()
 
-                post_json_filepath = None
-                comments_json_filepath = None
-                if not self.args.no_json:
-                    post_json_filepath = os.path.join(
-                        output_directory,
-                        self.post_json_path_template.substitute(self.format_vars)
-                    )
-                    comments_json_filepath = os.path.join(
-                        output_directory,
-                        self.comments_json_path_template.substitute(self.format_vars)
-                    )
+    async def write_files(self, queue: asyncio.Queue) -> None:
+        """
+        Runs the (write_function, *args) items from the queue in a worker thread,
+        one after another, until it receives None.
+        """
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            write_function, *args = item
+            try:
+                await asyncio.to_thread(write_function, *args)
+            except Exception as e:
+                print(f"Error writing file: {e}")
 
-                # if not os.path.exists(md_filepath):
-                if self.args.offline:
-                    json_filepath = os.path.join(
-                        output_directory,
-                        self.post_json_path_template.substitute(self.format_vars)
-                    )
-                    with open(json_filepath) as f:
-                        post_preloads = json.load(f)
-                    title, subtitle, like_count, date, md = self.extract_post_data_from_preloads(post_preloads)
-                else:
-                    soup = await self.get_url_soup(url)
-                    if soup is None:
-                        continue
-                    title, subtitle, like_count, date, md = self.extract_post_data(soup)
-                    post_preloads = await self.get_window_preloads(soup)
-                    date = post_preloads["post"]["post_date"] # date in ISO format: "2025-10-01T14:43:48.389Z"
-
-                if True:
-                    post_id = post_preloads["post"]["id"]
-
-                if True:
-                    if not self.args.no_images:
-                        total_images = count_images_in_markdown(md)
-                        with tqdm(total=total_images, desc=f"Downloading images for {post_slug}", leave=False) as img_pbar:
-                            md = await self.process_markdown_images(md, img_pbar)
-
-                md = self.process_markdown_links(md)
-
-                if True:
-                    comments_html = None
-                    comments_num = None
-                    if not self.args.no_comments:
-                        comments_url = url + "/comments"
-                        # comments_url = "https://willstorr.substack.com/p/scamming-substack/comments" # test
-                        if self.args.offline:
-                            json_filepath = os.path.join(
-                                output_directory,
-                                self.comments_json_path_template.substitute(self.format_vars)
-                            )
-                            with open(json_filepath) as f:
-                                comments_preloads = json.load(f)
-                        else:
-                            comments_soup = await self.get_url_soup(comments_url)
-                            comments_preloads = await self.get_window_preloads(comments_soup)
-                        if not self.args.no_json:
-                            json_filepath = os.path.join(
-                                output_directory,
-                                self.comments_json_path_template.substitute(self.format_vars)
-                            )
-                            _json = json.dumps(comments_preloads, **json_dump_kwargs)
-                            self.save_to_file(json_filepath, _json)
-                        comments_num = self.count_comments(comments_preloads)
-                        if comments_num > 0:
-                            comments_html = self.render_comments_html(comments_preloads)
-                            comments_html = (
-                                '\n\n' +
-                                '<hr>\n' +
-                                # this can collide with other elements with id="comments"
-                                # '<section id="comments">\n' +
-                                '<section class="comments">\n' +
-                                '<h2>Comments</h2>\n' +
-                                '<details open>\n' +
-                                f'<summary>{comments_num} comments</summary>\n' +
-                                comments_html + '\n' +
-                                '</details>'
-                                '</section>'
-                            )
-                            md += comments_html
-
-                    self.save_to_file(md_filepath, md)
+    async def scrape_post(self, url: str, posts_json_dir: str) -> Optional[dict]:
+        """
+        Scrapes a single post and saves it as markdown and html files.
+        Returns the post metadata for posts.json, or None if the post was skipped.
+        """
+        output_directory = self.format_vars["output_directory"]
+        try:
+            post_slug = url.split("/")[-1]
+            format_vars = {
+                **self.format_vars,
+                "post_slug": post_slug,
+            }
 
+            md_filepath = os.path.join(
+                output_directory,
+                self.md_path_template.substitute(format_vars)
+            )
+            format_vars["md_filepath"] = md_filepath
+            format_vars["md_directory"] = os.path.dirname(md_filepath)
+            # links in the markdown are relative to the file that stores it
+            if self.args.output_format == "jsonl":
+                format_vars["link_directory"] = os.path.dirname(self.posts_jsonl_path) or "."
+            else:
+                format_vars["link_directory"] = format_vars["md_directory"]
+
+            html_filepath = os.path.join(
+                output_directory,
+                self.html_path_template.substitute(format_vars)
+            )
+            format_vars["html_filepath"] = html_filepath
+            format_vars["html_directory"] = os.path.dirname(html_filepath)
+
+            # also needed with --no-json, to read posts in offline mode
+            post_json_filepath = os.path.join(
+                output_directory,
+                self.post_json_path_template.substitute(format_vars)
+            )
+            comments_json_filepath = os.path.join(
+                output_directory,
+                self.comments_json_path_template.substitute(format_vars)
+            )
+
+            if self.args.output_format == "jsonl":
+                is_scraped = url in self.existing_jsonl_urls
+            else:
+                is_scraped = os.path.normpath(md_filepath) in self.existing_md_filepaths
+            if (
+                not self.args.force and
+                not self.args.offline and
+                is_scraped
+            ):
+                # skip the download. posts.json keeps the metadata from the previous run
+                return None
+
+            if self.args.offline:
+                post_preloads = orjson.loads(await asyncio.to_thread(Path(post_json_filepath).read_bytes))
+                title, subtitle, like_count, date, md = self.extract_post_data_from_preloads(post_preloads)
+            else:
+                soup = await self.get_url_soup(url)
+                if soup is None:
+                    return None
+                title, subtitle, like_count, date, md = self.extract_post_data(soup)
+                post_preloads = await self.get_window_preloads(soup, url)
+                date = post_preloads["post"]["post_date"] # date in ISO format: "2025-10-01T14:43:48.389Z"
+
+            if True:
+                post_id = post_preloads["post"]["id"]
+
+            if True:
+                if not self.args.no_images:
+                    # process_markdown_images sets the total when it has found the images
+                    with tqdm(desc=f"Downloading images for {post_slug}", leave=False) as img_pbar:
+                        md = await self.process_markdown_images(md, format_vars, img_pbar)
+
+            md = self.process_markdown_links(md, format_vars)
+
+            if True:
+                comments_html = None
+                comments_num = None
+                if not self.args.no_comments:
+                    comments_url = url + "/comments"
+                    # comments_url = "https://willstorr.substack.com/p/scamming-substack/comments" # test
+                    if self.args.offline:
+                        comments_preloads = orjson.loads(
+                            await asyncio.to_thread(Path(comments_json_filepath).read_bytes)
+                        )
+                    else:
+                        comments_soup = await self.get_url_soup(comments_url)
+                        comments_preloads = await self.get_window_preloads(comments_soup, comments_url)
                     if not self.args.no_json:
-                        json_filepath = os.path.join(
-                            output_directory,
-                            self.post_json_path_template.substitute(self.format_vars)
+                        _json = dumps_json(comments_preloads)
+                        self.makedirs(os.path.dirname(comments_json_filepath))
+                        await self.write_queue.put((write_bytes_atomic, comments_json_filepath, _json))
+                    comments_num = self.count_comments(comments_preloads)
+                    if comments_num > 0:
+                        comments_html = self.render_comments_html(comments_preloads)
+                        comments_html = (
+                            '\n\n' +
+                            '<hr>\n' +
+                            # this can collide with other elements with id="comments"
+                            # '<section id="comments">\n' +
+                            '<section class="comments">\n' +
+                            '<h2>Comments</h2>\n' +
+                            '<details open>\n' +
+                            f'<summary>{comments_num} comments</summary>\n' +
+                            comments_html + '\n' +
+                            '</details>'
+                            '</section>'
                         )
-                        _json = json.dumps(post_preloads, **json_dump_kwargs)
-                        self.save_to_file(json_filepath, _json)
+                        md += comments_html
+
+                if self.args.output_format == "jsonl":
+                    # one line per post in the archive instead of small files
+                    record = {"url": url, "title": title, "md": md}
+                    if not self.args.no_html:
+                        record["html"] = self.md_to_html(md)
+                    # appending from the single writer keeps lines from interleaving
+                    await self.write_queue.put((self.jsonl_file.write, orjson.dumps(record) + b"\n"))
+                    file_link = relpath_fast(self.posts_jsonl_path, posts_json_dir) + "#" + post_slug
+                else:
+                    self.makedirs(format_vars["md_directory"])
+                    await self.write_queue.put((self.save_to_file, md_filepath, md))
+                    file_link = relpath_fast(md_filepath, posts_json_dir)
+
+                if not self.args.no_json:
+                    _json = dumps_json(post_preloads)
+                    self.makedirs(os.path.dirname(post_json_filepath))
+                    await self.write_queue.put((write_bytes_atomic, post_json_filepath, _json))
 
+                if not self.args.no_html and self.args.output_format == "files":
                     # Convert markdown to HTML and save
                     html_content = self.md_to_html(md)
+                    self.makedirs(format_vars["html_directory"])
                     # if self.args.offline:
                     #     html_content = post_preloads["post"]["body_html"]
                     # else:
                     #     html_content = self.md_to_html(md)
-                    self.save_to_html_file(html_filepath, html_content)
-
-                    post = {
-                        "id": post_id,
-                        "slug": post_preloads["post"]["slug"],
-                        "title": title,
-                        "subtitle": subtitle,
-                        "like_count": like_count,
-                        "comment_count": comments_num,
-                        "repost_count": post_preloads["post"]["restacks"],
-                        "date": date,
-                        "file_link": os.path.relpath(md_filepath, posts_json_dir),
-                        "html_link": os.path.relpath(html_filepath, posts_json_dir),
-                    }
+                    await self.write_queue.put((self.save_to_html_file, html_filepath, html_content))
+
+                post = {
+                    "id": post_id,
+                    "slug": post_preloads["post"]["slug"],
+                    "title": title,
+                    "subtitle": subtitle,
+                    "like_count": like_count,
+                    "comment_count": comments_num,
+                    "repost_count": post_preloads["post"]["restacks"],
+                    "date": date,
+                    "file_link": file_link,
+                }
+
+                if not self.args.no_html and self.args.output_format == "files":
+                    post["html_link"] = relpath_fast(html_filepath, posts_json_dir)
 
-                    if not self.args.no_json:
-                        post["post_json"] = os.path.relpath(post_json_filepath, posts_json_dir)
-                        post["comments_json"] = os.path.relpath(comments_json_filepath, posts_json_dir)
+                if not self.args.no_json:
+                    post["post_json"] = relpath_fast(post_json_filepath, posts_json_dir)
+                    post["comments_json"] = relpath_fast(comments_json_filepath, posts_json_dir)
 
-                    posts_data.append(post)
-                else:
-                    print(f"File already exists: {md_filepath}")
-            except Exception as e:
-                print(f"Error scraping post: {e}")
-                # raise e # debug
-        self.save_posts_data_json(posts_data)
-        self.generate_main_md_file()
-        self.generate_main_html_file()
+                return post
+            else:
+                print(f"File already exists: {md_filepath}")
+        except Exception as e:
+            print(f"Error scraping post: {e}")
+            # raise e # debug
+        return None
 
     def generate_main_md_file(self) -> None:
         """
         Generates a Markdown file for the given author.
         """
         # Read JSON data
-        posts_json_path = os.path.join(
-            self.format_vars["output_directory"],
-            self.posts_json_path_template.substitute(self.format_vars)
-        )
-        with open(posts_json_path, 'r', encoding='utf-8') as file:
-            posts_data = json.load(file)
+        posts_json_path = self.posts_json_path
+        with open(posts_json_path, 'rb') as file:
+            posts_data = orjson.loads(file.read())
 
         # sort by post_id, descending
-        posts_data.sort(key=lambda p: -1*p["id"])
+        posts_data.sort(key=lambda p: p["id"], reverse=True)
 
         last_post = posts_data[0]
         last_post_json_path = last_post["post_json"]
@@ -727,17 +1208,12 @@ class BaseSubstackScraper(ABC):
             last_post_json_path
         )
 
-        with open(last_post_json_path, 'r', encoding='utf-8') as file:
-            last_post = json.load(file)
+        with open(last_post_json_path, 'rb') as file:
+            last_post = orjson.loads(file.read())
 
         publication = last_post["pub"]
 
-        md_output_path = os.path.join(
-            self.format_vars["output_directory"],
-            self.posts_md_path_template.substitute(self.format_vars)
-        )
-
-        with open(md_output_path, 'w', encoding='utf-8') as file:
+        with open(self.posts_md_path, 'w', encoding='utf-8') as file:
             file.write(f'# {publication["name"]}\n')
             file.write('\n')
             # author_url = f'https://substack.com/@{publication["author_handle"]}' # variable
@@ -778,137 +1254,219 @@ class BaseSubstackScraper(ABC):
         Generates a HTML file for the given author.
         """
         # Read JSON data
-        posts_json_path = os.path.join(
-            self.format_vars["output_directory"],
-            self.posts_json_path_template.substitute(self.format_vars)
-        )
-        with open(posts_json_path, 'r', encoding='utf-8') as file:
-            posts_data = json.load(file)
+        with open(self.posts_json_path, 'rb') as file:
+            posts_data = orjson.loads(file.read())
 
         # Convert JSON data to a JSON string for embedding
-        embedded_json_data = json.dumps(posts_data, **json_dump_kwargs)
+        embedded_json_data = orjson.dumps(posts_data).decode('utf-8')
 
-        md_output_path = os.path.join(
-            self.format_vars["output_directory"],
-            self.posts_md_path_template.substitute(self.format_vars)
-        )
+        html_output_path = self.posts_html_path
 
-        html_output_path = os.path.join(
-            self.format_vars["output_directory"],
-            self.posts_html_path_template.substitute(self.format_vars)
-        )
+        prefix, separator, suffix = load_author_template(self.args.author_template)
 
-        with open(self.args.author_template, 'r', encoding='utf-8') as file:
-            html_template = file.read()
-
-        html_with_data = html_template
-
-        # patch assets path
         assets_path = self.args.assets_dir
         if not os.path.isabs(assets_path):
             assets_path = os.path.relpath(assets_path, os.path.dirname(html_output_path))
-        html_with_data = html_with_data.replace('"../assets', f'"{assets_path}')
 
-        html_with_data = html_with_data.replace('<!-- AUTHOR_NAME -->', self.publication_handle)
+        replacements = {
+            '"../assets': f'"{assets_path}', # patch assets path
+            '<!-- AUTHOR_NAME -->': self.publication_handle,
+        }
+
+        def patch_template(text):
+            return AUTHOR_TEMPLATE_PATTERN.sub(lambda match: replacements[match.group(0)], text)
 
         # Insert the JSON string into the script tag in the HTML template
-        html_with_data = html_with_data.replace(
-            '<script type="application/json" id="essaysData"></script>',
-            f'<script type="application/json" id="essaysData">{embedded_json_data}</script>'
-        )
+        html_with_data = patch_template(prefix)
+        if separator:
+            html_with_data = ''.join([
+                html_with_data,
+                '<script type="application/json" id="essaysData">',
+                embedded_json_data,
+                '</script>',
+                patch_template(suffix),
+            ])
 
         # Write the modified HTML to a new file
         with open(html_output_path, 'w', encoding='utf-8') as file:
             file.write(html_with_data)
 
+    async def fetch_image_to_cache(self, url: str, cache_path: str) -> bool:
+        """Download an image into the image cache. Returns False on HTTP errors."""
+        async with self.image_semaphore:
+            async with self.http_session.get(url) as response:
+                if response.status != 200:
+                    return False
+                self.makedirs(os.path.dirname(cache_path))
+                # unique temp file, also when another run downloads the same url
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+                try:
+                    with open(fd, 'wb') as f:
+                        async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                            # a slow disk should not stall the other downloads
+                            await asyncio.to_thread(f.write, chunk)
+                    os.chmod(tmp_path, 0o644) # mkstemp creates private files
+                    os.replace(tmp_path, cache_path)
+                except BaseException:
+                    # also on cancellation, failed downloads should not pile up in the cache
+                    os.unlink(tmp_path)
+                    raise
+        return True
+
     async def download_image(
             self,
             url: str,
-            save_path: Path,
+            save_path: str,
             pbar: Optional[tqdm] = None
         ) -> Optional[str]:
         """Download image from URL and save to path."""
         try:
-            response = requests.get(url, stream=True)
-            if response.status_code == 200:
-                save_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(save_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                if pbar:
-                    pbar.update(1)
-                return str(save_path)
+            # images are shared by posts and runs through a cache keyed by URL
+            cache_path = self.get_image_cache_path(url)
+            if not os.path.exists(cache_path):
+                # posts with the same image, like the author avatar, await one download
+                fetch = self.image_fetches.get(url)
+                if fetch is None:
+                    fetch = self.image_fetches[url] = asyncio.ensure_future(
+                        self.fetch_image_to_cache(url, cache_path)
+                    )
+                if not await fetch:
+                    return None
+            self.makedirs(os.path.dirname(save_path))
+            link_file(cache_path, save_path)
+            if pbar:
+                pbar.update(1)
+            return save_path
         except Exception as exc:
             if pbar:
                 pbar.write(f"Error downloading image {url}: {str(exc)}")
             # raise exc # debug
         return None
 
+    def rewrite_image_links(self, md_content: str, format_vars: dict) -> Tuple[str, dict]:
+        """
+        Replaces the CDN image links with links to the local image files.
+        Returns the new markdown and the images to download as {save_path: url}.
+        Runs in a worker thread, so it does not touch the tasks of the event loop.
+        """
+        output_directory = format_vars["output_directory"]
+        link_directory = format_vars["link_directory"]
+        # every image is linked twice: [![](x.png)](x.png)
+        replacements = {} # cdn url: replacement
+        images = {} # save_path: url
+        # one copy of the post's variables, only image_filename changes per image
+        image_format_vars = dict(format_vars)
+
+        def get_replacement(match):
+            cdn_url = match.group(1)
+            replacement = replacements.get(cdn_url)
+            if replacement is not None:
+                return replacement
+            url = resolve_image_url(cdn_url)
+            image_format_vars["image_filename"] = sanitize_image_filename(url)
+            # plain strings, a Path per image would only be converted back
+            save_path = os.path.normpath(os.path.join(
+                output_directory,
+                self.image_path_template.substitute(image_format_vars)
+            ))
+            image_directory, image_name = os.path.split(save_path)
+            if not self.args.offline and save_path not in self.get_existing_images(image_directory):
+                images[save_path] = url
+            rel_path = save_path
+            if not os.path.isabs(rel_path):
+                # one relpath per image directory, not per image
+                rel_path = os.path.normpath(os.path.join(
+                    relpath_cached(image_directory, link_directory),
+                    image_name
+                ))
+            replacement = replacements[cdn_url] = f"({rel_path})"
+            return replacement
+
+        return CDN_IMAGE_URL_PATTERN.sub(get_replacement, md_content), images
+
     async def process_markdown_images(
             self,
             md_content: str,
+            format_vars: dict,
             pbar=None
         ) -> str:
         """Process markdown content to download images and update references."""
-        output_directory = self.format_vars["output_directory"]
-        # [![](https://substackcdn.com/image/fetch/x.png)](https://substackcdn.com/image/fetch/x.png)
-        pattern = re.compile(r'\((https://substackcdn\.com/image/fetch/[^\s\)]+)\)')
-        buf = io.StringIO()
-        last_end = 0
-        for match in pattern.finditer(md_content):
-            buf.write(md_content[last_end:match.start()])
-            url = match.group(1)
-            url = resolve_image_url(url)
-            filename = sanitize_image_filename(url)
-            format_vars = {
-                **self.format_vars,
-                "image_filename": filename,
-            }
-            save_path = Path(os.path.join(
-                output_directory,
-                self.image_path_template.substitute(format_vars)
-            ))
-            if not save_path.exists() and not self.args.offline:
-                await self.download_image(url, save_path, pbar)
-            md_directory = self.format_vars["md_directory"]
-            rel_path = save_path
-            if not os.path.isabs(rel_path):
-                rel_path = os.path.relpath(save_path, md_directory)
-            buf.write(f"({rel_path})")
-            last_end = match.end()
-        buf.write(md_content[last_end:])
-        return buf.getvalue()
+        if CDN_IMAGE_URL_PREFIX not in md_content:
+            # posts without images skip the worker thread and the regex pass
+            return md_content
+        # the regex pass and the scandir calls would block other downloads
+        md_content, images = await asyncio.to_thread(self.rewrite_image_links, md_content, format_vars)
+        downloads = []
+        num_downloads = 0
+        for save_path, url in images.items():
+            # posts scraped at the same time can share images, download them once
+            download = self.image_downloads.get(save_path)
+            if download is None:
+                download = self.image_downloads[save_path] = asyncio.ensure_future(
+                    self.download_image(url, save_path, pbar)
+                )
+                num_downloads += 1
+            downloads.append(download)
+        if pbar is not None:
+            # the downloads have not started yet, they run in the gather below
+            pbar.total = num_downloads
+            pbar.refresh()
+        # the links do not depend on the downloads, so fetch all images at once
+        await asyncio.gather(*downloads)
+        return md_content
 
-    def process_markdown_links(self, md_content):
+    def process_markdown_links(self, md_content, format_vars):
         # patch links to other posts of this publication
-        pattern = re.compile(r'\]\(https://' + self.publication_handle + r'\.substack\.com/p/([^\s\)]+)\)')
-        md_directory = self.format_vars["md_directory"]
-        output_directory = self.format_vars["output_directory"]
+        if self.post_link_prefix not in md_content:
+            return md_content
+        pattern = self.post_link_pattern
+        link_directory = format_vars["link_directory"]
+        output_directory = format_vars["output_directory"]
+        if self.args.output_format == "jsonl":
+            # same form as the file_link of posts.json
+            posts_jsonl_rel = os.path.relpath(self.posts_jsonl_path, link_directory)
+            return pattern.sub(lambda match: '](' + posts_jsonl_rel + '#' + match.group(1) + ')', md_content)
+        # one copy of the post's variables, only post_slug changes per link
+        link_format_vars = dict(format_vars)
         def get_replacement(match):
-            post_slug = match.group(1)
+            link_format_vars["post_slug"] = match.group(1)
             md_filepath = os.path.join(
                 output_directory,
-                self.md_path_template.substitute({
-                    **self.format_vars,
-                    "post_slug": post_slug,
-                })
+                self.md_path_template.substitute(link_format_vars)
             )
-            md_filepath_rel = os.path.relpath(md_filepath, md_directory)
+            md_filepath_rel = os.path.relpath(md_filepath, link_directory)
             return '](' + md_filepath_rel + ')'
-        md_content = re.sub(pattern, get_replacement, md_content)
+        md_content = pattern.sub(get_replacement, md_content)
         return md_content
 
 
 class SubstackScraper(BaseSubstackScraper):
-    async def get_url_soup(self, url: str) -> Optional[BeautifulSoup]:
+    async def get_url_soup(self, url: str) -> Optional[LexborHTMLParser]:
         """
-        Gets soup from URL using requests
+        Gets soup from URL using aiohttp
         """
         try:
-            page = requests.get(url, headers=None)
-            soup = BeautifulSoup(page.content, "html.parser")
-            if soup.find("h2", class_="paywall-title"):
+            cache_path = self.get_http_cache_path(url)
+            headers = self.get_conditional_headers(url)
+            for attempt in range(MAX_RETRIES + 1):
+                async with self.http_session.get(url, headers=headers) as response:
+                    if response.status in RETRY_STATUS_CODES and attempt < MAX_RETRIES:
+                        # back off without holding the connection
+                        delay = get_retry_delay(response.headers, attempt)
+                    elif response.status == 304:
+                        content = await asyncio.to_thread(Path(cache_path).read_bytes)
+                        break
+                    else:
+                        content = await response.read()
+                        if response.status == 200:
+                            if self.has_http_validator(response.headers):
+                                self.makedirs(self.http_cache_directory)
+                                await asyncio.to_thread(write_bytes_atomic, cache_path, content)
+                            self.update_http_cache(url, response.headers)
+                        break
+                await asyncio.sleep(delay)
+            soup = LexborHTMLParser(content)
+            if soup.css_first(PAYWALL_SELECTOR) is not None:
                 print(f"Skipping premium article: {url}")
                 return None
             return soup
@@ -917,6 +1475,9 @@ class SubstackScraper(BaseSubstackScraper):
 
 
 class PremiumSubstackScraper(BaseSubstackScraper):
+    # number of browser tabs loading pages at the same time
+    max_concurrency: int = 4
+
     def __init__(self, args) -> None:
         super().__init__(args)
 
@@ -936,8 +1497,13 @@ class PremiumSubstackScraper(BaseSubstackScraper):
 
         atexit.register(self._cleanup_sync)
 
+        self.chrome_options = self.get_chrome_options()
+
+    def get_chrome_options(self):
+        # selenium is only needed for premium scrapes, so import it here
+        from selenium_driverless import webdriver
+
         options = webdriver.ChromeOptions()
-        self.chrome_options = options
         if self.args.headless:
             # modern headless flag (works better with recent Chromium)
             options.add_argument("--headless=new")
@@ -945,20 +1511,38 @@ class PremiumSubstackScraper(BaseSubstackScraper):
             options.binary_location = self.args.chromium_path
         if self.args.user_agent:
             options.add_argument(f"user-agent={self.args.user_agent}")
+        if self.args.chromium_profile_dir:
+            # keep the login cookies for the next run.
+            # selenium_driverless deletes the user data dir on quit by default
+            options.add_argument(f"--user-data-dir={self.args.chromium_profile_dir}")
+            options.auto_clean_dirs = False
+        return options
 
     async def _async_init(self):
-        self._loop = asyncio.get_running_loop()
+        await super()._async_init()
 
         await self._start_driver()
-        await self.login()
+        if not await self.is_logged_in():
+            await self.login()
+        await self._open_tabs()
         return self
 
     async def _start_driver(self):
+        from selenium_driverless import webdriver
         self.driver = await webdriver.Chrome(options=self.chrome_options)
 
+    async def _open_tabs(self):
+        # all tabs share the cookies of the logged in session
+        self.tabs = asyncio.Queue()
+        for _ in range(self.max_concurrency):
+            tab = await self.driver.new_window("tab", activate=False)
+            self.tabs.put_nowait(tab)
+
     async def close(self) -> None:
+        await super().close()
         if self.driver:
-            await self.driver.quit()
+            # never delete the profile the user asked to keep
+            await self.driver.quit(clean_dirs=not self.args.chromium_profile_dir)
 
     def _cleanup_sync(self):
         try:
@@ -974,29 +1558,46 @@ class PremiumSubstackScraper(BaseSubstackScraper):
         except Exception as exc:
             print("_cleanup_sync failed:", exc)
 
+    async def is_logged_in(self) -> bool:
+        """
+        Check for the login cookie of a previous run in the persistent chromium profile.
+        """
+        if not self.args.chromium_profile_dir:
+            # a new profile has no cookies
+            return False
+        await self.driver.get("https://substack.com/")
+        cookies = await self.driver.get_cookies()
+        return any(cookie["name"] == LOGGED_IN_COOKIE for cookie in cookies)
+
     async def login(self):
+        from selenium_driverless.types.by import By
+
         await self.driver.get("https://substack.com/sign-in")
-        await asyncio.sleep(2)
 
+        # wait for the elements instead of sleeping for a fixed time
         signin = await self.driver.find_element(
-            By.XPATH, "//a[contains(@class,'login-option')]"
+            By.XPATH, "//a[contains(@class,'login-option')]", timeout=LOGIN_TIMEOUT
         )
         await signin.click()
 
-        await asyncio.sleep(2)
-
-        email = await self.driver.find_element(By.NAME, "email")
-        password = await self.driver.find_element(By.NAME, "password")
+        email = await self.driver.find_element(By.NAME, "email", timeout=LOGIN_TIMEOUT)
+        password = await self.driver.find_element(By.NAME, "password", timeout=LOGIN_TIMEOUT)
 
         await email.send_keys(self.args.email)
         await password.send_keys(self.args.password)
 
         submit = await self.driver.find_element(
-            By.XPATH, "//*[@id='substack-login']//form//button"
+            By.XPATH, "//*[@id='substack-login']//form//button", timeout=LOGIN_TIMEOUT
         )
         await submit.click()
 
-        await asyncio.sleep(8)
+        # poll until substack leaves the sign-in page or shows an error
+        for _ in range(LOGIN_TIMEOUT * 2):
+            await asyncio.sleep(0.5)
+            if "/sign-in" not in await self.driver.current_url:
+                break
+            if await self.is_login_failed():
+                break
 
         if await self.is_login_failed():
             raise RuntimeError("Substack login failed")
@@ -1005,16 +1606,21 @@ class PremiumSubstackScraper(BaseSubstackScraper):
         """
         Check for the presence of the 'error-container' to indicate a failed login attempt.
         """
+        from selenium_driverless.types.by import By
         elements = await self.driver.find_elements(By.ID, "error-container")
         return bool(elements)
 
     async def get_url_soup(self, url: str):
         """
-        Gets soup from URL using logged in selenium driver
+        Gets soup from URL using a free tab of the logged in selenium driver
         """
-        await self.driver.get(url)
-        html = await self.driver.page_source
-        return BeautifulSoup(html, "html.parser")
+        tab = await self.tabs.get()
+        try:
+            await tab.get(url)
+            html = await tab.page_source
+        finally:
+            self.tabs.put_nowait(tab)
+        return LexborHTMLParser(html)
 
     async def download_image_FIXME(
             self,
@@ -1034,6 +1640,10 @@ class PremiumSubstackScraper(BaseSubstackScraper):
         # but that requires lots of boilerplate code
         # fix: use https://github.com/milahu/aiohttp_chromium
 
+        # a previous run already downloaded this image
+        if os.path.exists(save_path) and os.path.getsize(save_path) > 0:
+            return str(save_path)
+
         try:
             # Execute JS fetch inside browser
             result = await self.driver.execute_async_script(
@@ -1050,7 +1660,10 @@ class PremiumSubstackScraper(BaseSubstackScraper):
                         canvas.height = img.height;
                         const ctx = canvas.getContext('2d');
                         ctx.drawImage(img, 0, 0);
-                        const dataUrl = canvas.toDataURL('image/png'); // returns "data:image/png;base64,..."
+                        // jpeg sources: the jpeg encoder is much faster than png deflate, and smaller.
+                        // other formats are encoded as png, as before
+                        const mime = /\.jpe?g$/i.test(new URL(url).pathname) ? 'image/jpeg' : 'image/png';
+                        const dataUrl = canvas.toDataURL(mime, 0.92); // returns "data:image/...;base64,..."
                         const base64 = dataUrl.split(',')[1]; // strip prefix
                         callback({data: base64});
                     } catch (err) {
@@ -1069,11 +1682,10 @@ class PremiumSubstackScraper(BaseSubstackScraper):
                 raise RuntimeError(f"{result['error']}\nJS stack:\n{result['stack']}")
 
             # Decode base64 to bytes
-            image_bytes = base64.b64decode(result)
+            image_bytes = base64.b64decode(result["data"])
 
-            save_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(save_path, "wb") as f:
-                f.write(image_bytes)
+            self.makedirs(save_path.parent)
+            await asyncio.to_thread(save_path.write_bytes, image_bytes)
 
             if pbar:
                 pbar.update(1)
@@ -1087,7 +1699,19 @@ class PremiumSubstackScraper(BaseSubstackScraper):
             return None
 
 
-def parse_args() -> argparse.Namespace:
+def non_negative_int(value: str) -> int:
+    """argparse type for counts where 0 means the default."""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or a positive number, got {number}")
+    return number
+
+
+@functools.lru_cache(maxsize=1)
+def get_arg_parser() -> argparse.ArgumentParser:
+    """
+    Builds the argument parser once, also when main is called repeatedly in one process.
+    """
     parser = argparse.ArgumentParser(description="Scrape a Substack site.")
     parser.add_argument(
         "--config", type=str, help="JSON config file with email and password."
@@ -1112,10 +1736,16 @@ def parse_args() -> argparse.Namespace:
         default=0,
         help="The number of posts to scrape. If 0 or not provided, all posts will be scraped.",
     )
+    parser.add_argument(
+        "--concurrency", # args.concurrency
+        type=non_negative_int,
+        default=0,
+        help=f"The number of posts to scrape at the same time. If 0 or not provided, {BaseSubstackScraper.max_concurrency} posts, or {PremiumSubstackScraper.max_concurrency} with --premium.",
+    )
     # this was based on the wrong assumption
     # that post_preloads JSON data contains the same body_html as the HTML page, but
     # post_preloads["post"]["body_html"] contains HTML components with "data-attrs" attributes
-    # str(soup.select_one("div.available-content")) is clean HTML
+    # soup.css_first("div.available-content").html is clean HTML
     # TODO convert HTML components to clean HTML
     # parser.add_argument(
     #     "--offline", # args.offline
@@ -1149,6 +1779,13 @@ def parse_args() -> argparse.Namespace:
         default="",
         help='Optional: The path to the Chromium browser executable (i.e. "path/to/chromium").',
     )
+    parser.add_argument(
+        "--chromium-profile-dir", # args.chromium_profile_dir
+        type=str,
+        default="",
+        help="Optional: Keep the Chromium profile in this directory, to reuse the login of the "
+        "Premium Substack Scraper in later runs.",
+    )
     parser.add_argument(
         "--user-agent",
         type=str,
@@ -1211,6 +1848,24 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_COMMENTS_JSON_PATH_FORMAT,
         help=f"The file path format to save scraped comments as JSON files. Default: {DEFAULT_COMMENTS_JSON_PATH_FORMAT!r}",
     )
+    parser.add_argument(
+        "--http-cache-path-format", # args.http_cache_path_format
+        type=str,
+        default=DEFAULT_HTTP_CACHE_PATH_FORMAT,
+        help=f"The directory path format to cache HTTP responses for conditional requests. Default: {DEFAULT_HTTP_CACHE_PATH_FORMAT!r}",
+    )
+    parser.add_argument(
+        "--posts-jsonl-path-format", # args.posts_jsonl_path_format
+        type=str,
+        default=DEFAULT_POSTS_JSONL_PATH_FORMAT,
+        help=f"The file path format of the JSONL archive of scraped posts with --output-format=jsonl. Default: {DEFAULT_POSTS_JSONL_PATH_FORMAT!r}",
+    )
+    parser.add_argument(
+        "--output-format", # args.output_format
+        choices=OUTPUT_FORMATS,
+        default="files",
+        help=f"Write every post to its own Markdown and HTML files, or append all posts to one JSONL archive. Default: 'files'",
+    )
     parser.add_argument(
         "--no-images", # args.no_images
         action="store_true",
@@ -1226,8 +1881,27 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help=f"Do not write JSON files.",
     )
+    parser.add_argument(
+        "--no-html", # args.no_html
+        action="store_true",
+        help=f"Do not convert posts to HTML files.",
+    )
+    parser.add_argument(
+        "--gzip-html", # args.gzip_html
+        action="store_true",
+        help=f"Also write gzip-compressed copies of the HTML files for web servers.",
+    )
+    parser.add_argument(
+        "--force", # args.force
+        action="store_true",
+        help=f"Scrape posts again, even if their Markdown file already exists.",
+    )
+
+    return parser
+
 
-    return parser.parse_args()
+def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    return get_arg_parser().parse_args(args)
 
 
 async def async_main():
@@ -1236,8 +1910,8 @@ async def async_main():
     args.offline = False
 
     if args.config:
-        with open(args.config) as f:
-            config = json.load(f)
+        with open(args.config, 'rb') as f:
+            config = orjson.loads(f.read())
         args.email = config["email"]
         args.password = config["password"]
         # TODO more
@@ -1261,7 +1935,14 @@ async def async_main():
 
 
 def main():
-    asyncio.run(async_main())
+    try:
+        # libuv based event loop, faster scheduling of the many concurrent requests
+        import uvloop
+    except ImportError:
+        uvloop = None
+    # uvloop.run was added in uvloop 0.18
+    run = getattr(uvloop, "run", None) or asyncio.run
+    run(async_main())
 
 
 if __name__ == "__main__":
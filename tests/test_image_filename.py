@@ -0,0 +1,27 @@
+import os
+import unittest
+
+from substack2markdown.substack_scraper import guess_image_extension, sanitize_image_filename
+
+
+class GuessImageExtensionTest(unittest.TestCase):
+    def test_path_extension(self):
+        self.assertEqual(guess_image_extension("https://example.com/a/image.PNG"), ".png")
+
+    def test_format_query(self):
+        self.assertEqual(guess_image_extension("https://example.com/image?format=webp"), ".webp")
+
+    def test_unknown_format_query(self):
+        self.assertEqual(guess_image_extension("https://example.com/image?format=exe"), ".jpg")
+
+    def test_format_query_path_traversal(self):
+        url = "https://example.com/" + "x" * 120 + "?format=png%2F..%2F..%2Fx"
+        self.assertEqual(guess_image_extension(url), ".jpg")
+        filename = sanitize_image_filename(url)
+        self.assertNotIn(os.sep, filename)
+        self.assertNotIn("..", filename)
+        self.assertTrue(filename.endswith(".jpg"))
+
+
+if __name__ == "__main__":
+    unittest.main()
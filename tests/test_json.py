@@ -0,0 +1,26 @@
+import json
+import unittest
+
+from substack2markdown.substack_scraper import dumps_json
+
+
+class DumpsJsonTest(unittest.TestCase):
+    def assertSameAsJson(self, obj):
+        self.assertEqual(dumps_json(obj), json.dumps(obj, indent=0, ensure_ascii=False).encode("utf-8"))
+
+    def test_flat_list(self):
+        self.assertSameAsJson([{"title": "a", "date": "2025-10-01", "likes": 3}])
+
+    def test_nested(self):
+        self.assertSameAsJson({
+            "post": {"title": "Ümlaut \"quoted\"", "tags": ["x", "y"], "empty": [], "none": None},
+            "comments": [{"body": "line1\nline2", "children": [{"id": 2, "children": []}]}],
+            "flag": True,
+        })
+
+    def test_scalar(self):
+        self.assertSameAsJson("text")
+
+
+if __name__ == "__main__":
+    unittest.main()
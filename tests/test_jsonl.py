@@ -0,0 +1,31 @@
+import os
+import tempfile
+import unittest
+
+from substack2markdown.substack_scraper import load_jsonl
+
+
+class LoadJsonlTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "posts.json.jsonl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_missing_file(self):
+        self.assertEqual(load_jsonl(self.path), [])
+
+    def test_truncated_last_line(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'{"url": "a"}\n\n{"url": "b"}\n{"url": "c", "ti')
+        self.assertEqual(load_jsonl(self.path), [{"url": "a"}, {"url": "b"}])
+
+    def test_last_line_without_newline(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'{"url": "a"}\n{"url": "b"}')
+        self.assertEqual(load_jsonl(self.path), [{"url": "a"}, {"url": "b"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
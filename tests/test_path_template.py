@@ -0,0 +1,42 @@
+import string
+import unittest
+
+from substack2markdown.substack_scraper import PathTemplate
+
+
+class PathTemplateTest(unittest.TestCase):
+    mapping = {"publication": "pub", "post_slug": "my-post"}
+
+    def assertSameAsTemplate(self, template):
+        self.assertEqual(
+            PathTemplate(template).substitute(self.mapping),
+            string.Template(template).substitute(self.mapping),
+        )
+
+    def test_named_and_braced(self):
+        self.assertEqual(PathTemplate("$publication/${post_slug}.md").format_string, "{publication}/{post_slug}.md")
+        self.assertSameAsTemplate("$publication/${post_slug}.md")
+
+    def test_literal_braces(self):
+        self.assertEqual(PathTemplate("{x}/$post_slug}").format_string, "{{x}}/{post_slug}}}")
+        self.assertSameAsTemplate("{x}/$post_slug}")
+        self.assertSameAsTemplate("{}{{$post_slug")
+
+    def test_escaped_dollar(self):
+        self.assertSameAsTemplate("$$post_slug/$$/${post_slug}")
+
+    def test_missing_key(self):
+        with self.assertRaises(KeyError):
+            PathTemplate("$unknown.md").substitute(self.mapping)
+
+    def test_invalid_placeholder(self):
+        for template in ("$post_slug/$/x", "$/x", "a\nb/$-"):
+            with self.assertRaises(ValueError) as expected:
+                string.Template(template).substitute(self.mapping)
+            with self.assertRaises(ValueError) as actual:
+                PathTemplate(template)
+            self.assertEqual(str(actual.exception), str(expected.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
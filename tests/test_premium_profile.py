@@ -0,0 +1,57 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+
+from substack2markdown.substack_scraper import PremiumSubstackScraper, parse_args
+
+try:
+    import selenium_driverless
+except ImportError:
+    selenium_driverless = None
+
+
+class FakeDriver:
+    """Deletes the user data dir on quit, like selenium_driverless with clean_dirs=True."""
+
+    def __init__(self, options):
+        self.options = options
+
+    async def quit(self, clean_dirs: bool = True) -> None:
+        if clean_dirs and self.options.user_data_dir:
+            shutil.rmtree(self.options.user_data_dir, ignore_errors=True)
+
+
+class FakeSession:
+    def close(self) -> None:
+        pass
+
+
+class FakeHttpSession:
+    async def close(self) -> None:
+        pass
+
+
+@unittest.skipIf(selenium_driverless is None, "selenium_driverless is not installed")
+class ChromiumProfileDirTest(unittest.TestCase):
+    def test_close_keeps_profile_dir(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            profile_dir = os.path.join(tmp, "profile")
+            os.mkdir(profile_dir)
+            scraper = PremiumSubstackScraper.__new__(PremiumSubstackScraper)
+            scraper.args = parse_args(["-u", "https://example.substack.com", "--chromium-profile-dir", profile_dir])
+            options = scraper.get_chrome_options()
+            self.assertEqual(options.user_data_dir, profile_dir)
+            self.assertFalse(options.auto_clean_dirs)
+
+            scraper.http_cache = {}
+            scraper.session = FakeSession()
+            scraper.http_session = FakeHttpSession()
+            scraper.driver = FakeDriver(options)
+            asyncio.run(scraper.close())
+            self.assertTrue(os.path.isdir(profile_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
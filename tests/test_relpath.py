@@ -0,0 +1,30 @@
+import os
+import unittest
+
+from substack2markdown.substack_scraper import relpath_fast
+
+
+class RelpathFastTest(unittest.TestCase):
+    def assertSameAsRelpath(self, path, start):
+        self.assertEqual(relpath_fast(path, start), os.path.relpath(path, start))
+
+    def test_below(self):
+        self.assertSameAsRelpath(os.path.join("out", "p", "post", "readme.md"), "out")
+        self.assertSameAsRelpath(os.path.join("out", ".", "p", "readme.md"), "out")
+
+    def test_sibling(self):
+        self.assertSameAsRelpath(os.path.join("out", "a", "readme.md"), os.path.join("out", "b"))
+        # a common string prefix is not a common directory
+        self.assertSameAsRelpath(os.path.join("out2", "readme.md"), "out")
+
+    def test_parent(self):
+        self.assertSameAsRelpath("out", os.path.join("out", "p"))
+        self.assertSameAsRelpath(os.path.join("out", "readme.md"), os.path.join("out", "p", "post"))
+
+    def test_identical(self):
+        self.assertSameAsRelpath("out", "out")
+        self.assertSameAsRelpath(os.path.join("out", "p"), os.path.join("out", "p"))
+
+
+if __name__ == "__main__":
+    unittest.main()